@@ -1,9 +1,14 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 import mysql.connector
+import hmac
+import io
 import os
+import queue
 from datetime import datetime
+from leaderboard_io import FORMATS, import_records, export_records, format_records, parse_records
+from leaderboard_stream import LeaderboardBroadcaster, sse_message
 
 # ---------------------------------------------------------------------
 # 🔹 Load environment variables
@@ -20,6 +25,10 @@ TIDB_CONFIG = {
 
 }
 API_SERVER = os.getenv("API_SERVER", "http://localhost:5000")
+IMPORT_TOKEN = os.getenv("IMPORT_TOKEN")
+LEADERBOARD_SIZE = 10
+STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on idle streams
+SNAPSHOT_MAX_AGE = 5   # seconds a cached top-N may be served to new streams
 
 # ---------------------------------------------------------------------
 # 🧩 Initialize Flask App
@@ -39,6 +48,32 @@ def get_db_connection():
         print(f"❌ TiDB connection failed: {e}")
         return None
 
+def fetch_top_scores(conn, limit=LEADERBOARD_SIZE):
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT player_name, score, level FROM leaderboard ORDER BY score DESC LIMIT %s", (limit,))
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+broadcaster = LeaderboardBroadcaster(LEADERBOARD_SIZE)
+
+
+def publish_top_scores(conn):
+    """Push the current top-N to live streams; never fails the caller"""
+    try:
+        broadcaster.refresh(lambda: fetch_top_scores(conn))
+        return True
+    except Exception as e:
+        print(f"⚠️ Failed to publish leaderboard update: {e}")
+        return False
+
+
+def is_admin_request():
+    """Bulk endpoints need "Authorization: Bearer $IMPORT_TOKEN"; off when unset"""
+    auth = request.headers.get("Authorization", "")
+    return bool(IMPORT_TOKEN) and hmac.compare_digest(auth.encode(), f"Bearer {IMPORT_TOKEN}".encode())
+
 # ---------------------------------------------------------------------
 # 🏗️ API ENDPOINTS
 # ---------------------------------------------------------------------
@@ -55,7 +90,7 @@ def get_leaderboard():
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS leaderboard (
                 id INT AUTO_INCREMENT PRIMARY KEY,
-                player_name VARCHAR(50),
+                player_name VARCHAR(50) NOT NULL UNIQUE,
                 score INT,
                 level INT,
                 last_played DATETIME
@@ -91,7 +126,7 @@ def save_score():
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS leaderboard (
                 id INT AUTO_INCREMENT PRIMARY KEY,
-                player_name VARCHAR(50),
+                player_name VARCHAR(50) NOT NULL UNIQUE,
                 score INT,
                 level INT,
                 last_played DATETIME
@@ -99,14 +134,17 @@ def save_score():
         """)
         cursor.execute("SELECT score FROM leaderboard WHERE player_name=%s", (player_name,))
         existing = cursor.fetchone()
+        changed = False
 
         if existing:
             if score > existing[0]:
+                changed = True
                 cursor.execute(
                     "UPDATE leaderboard SET score=%s, level=%s, last_played=%s WHERE player_name=%s",
                     (score, level, datetime.now(), player_name)
                 )
         else:
+            changed = True
             cursor.execute(
                 "INSERT INTO leaderboard (player_name, score, level, last_played) VALUES (%s, %s, %s, %s)",
                 (player_name, score, level, datetime.now())
@@ -114,6 +152,8 @@ def save_score():
 
         conn.commit()
         cursor.close()
+        if changed and broadcaster.might_change(score):
+            publish_top_scores(conn)
         conn.close()
         return jsonify({"status": "success"}), 200
 
@@ -121,6 +161,91 @@ def save_score():
         print(f"⚠️ Failed to save score: {e}")
         return jsonify({"error": str(e)}), 500
 
+
+@app.route("/api/import_scores", methods=["POST"])
+def import_scores():
+    """Bulk upsert scores streamed from the request body (?format=legacy|csv|ndjson)"""
+    if not is_admin_request():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    fmt = request.args.get("format", "legacy")
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format: {fmt}"}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"error": "DB connection failed"}), 500
+
+    try:
+        lines = io.TextIOWrapper(request.stream, encoding="utf-8-sig", newline="")
+        total = import_records(conn, parse_records(lines, fmt))
+        publish_top_scores(conn)
+        return jsonify({"status": "success", "imported": total}), 200
+    except Exception as e:
+        print(f"⚠️ Failed to import scores: {e}")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+
+@app.route("/api/export_scores", methods=["GET"])
+def export_scores():
+    """Stream the full leaderboard as NDJSON (default) or CSV"""
+    if not is_admin_request():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": f"Unsupported format: {fmt}"}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"error": "DB connection failed"}), 500
+
+    def generate():
+        try:
+            yield from format_records(export_records(conn), fmt)
+        finally:
+            conn.close()
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route("/api/leaderboard/stream", methods=["GET"])
+def stream_leaderboard():
+    """Server-Sent Events feed: full top-N on connect, then only changed rows"""
+    # The bulk-import CLI writes to the table without going through the
+    # broadcaster, so re-read once the cached snapshot gets old.
+    if not broadcaster.is_fresh(SNAPSHOT_MAX_AGE):
+        conn = get_db_connection()
+        if conn:
+            publish_top_scores(conn)
+            conn.close()
+    if broadcaster.snapshot() is None:
+        return jsonify({"error": "Leaderboard unavailable"}), 500
+
+    # Subscribe before taking the snapshot so no update can slip in between
+    q = broadcaster.subscribe()
+    snapshot = broadcaster.snapshot()
+
+    def generate():
+        try:
+            yield sse_message("snapshot", snapshot)
+            while True:
+                try:
+                    event = q.get(timeout=STREAM_HEARTBEAT)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield sse_message("update", event)
+        finally:
+            broadcaster.unsubscribe(q)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(generate(), mimetype="text/event-stream", headers=headers)
+
 # ---------------------------------------------------------------------
 # 🚀 Run Flask API
 # ---------------------------------------------------------------------
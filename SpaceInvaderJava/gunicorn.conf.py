@@ -0,0 +1,9 @@
+# gunicorn.conf.py
+# /api/leaderboard/stream holds a connection open per viewer, which would
+# pin a whole sync worker; threaded workers keep /api/save_score responsive.
+# The live leaderboard broadcaster lives in one process, so scale with
+# threads, not workers: a second worker would never see the first's saves.
+bind = "0.0.0.0:5000"
+workers = 1
+worker_class = "gthread"
+threads = 64
@@ -0,0 +1,286 @@
+# leaderboard_io.py
+"""Streaming bulk import/export for the leaderboard table.
+
+Usage:
+    python leaderboard_io.py migrate
+    python leaderboard_io.py import highscores.txt
+    python leaderboard_io.py import scores.csv
+    python leaderboard_io.py export > leaderboard.ndjson
+"""
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+
+CHUNK_SIZE = 500          # rows per multi-row upsert
+MAX_PENDING = 10000       # distinct players held in memory before flushing
+FORMATS = ("legacy", "csv", "ndjson")
+INT_MAX = 2**31 - 1       # upper bound of the MySQL INT score/level columns
+MIGRATE_ATTEMPTS = 3
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS leaderboard (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        player_name VARCHAR(50) NOT NULL UNIQUE,
+        score INT,
+        level INT,
+        last_played DATETIME
+    )
+"""
+
+# Keep each player's best row (lowest id on ties) before adding the key
+DELETE_DUPLICATES_SQL = """
+    DELETE l1 FROM leaderboard l1
+    JOIN leaderboard l2
+      ON l1.player_name = l2.player_name
+     AND (l1.score < l2.score OR (l1.score = l2.score AND l1.id > l2.id))
+"""
+
+# Only overwrite a row when the incoming score beats it. MySQL evaluates the
+# assignments left to right, so level/last_played must be set before score.
+UPSERT_SQL = """
+    INSERT INTO leaderboard (player_name, score, level, last_played)
+    VALUES {values}
+    ON DUPLICATE KEY UPDATE
+        level = IF(VALUES(score) > score, VALUES(level), level),
+        last_played = IF(VALUES(score) > score, VALUES(last_played), last_played),
+        score = GREATEST(score, VALUES(score))
+"""
+
+
+# ---------------------------------------------------------------------
+# 📥 Parsing
+# ---------------------------------------------------------------------
+def guess_format(filename):
+    """Pick an input format from a file extension (defaults to legacy name:score)."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "legacy"
+
+
+def _record(player_name, score, level=1):
+    player_name = (player_name or "").strip()
+    if not player_name:
+        raise ValueError("missing player_name")
+    score, level = int(score), int(level or 1)
+    # Out-of-range values would make MySQL reject the whole multi-row upsert
+    if not 0 <= score <= INT_MAX:
+        raise ValueError(f"score out of range: {score}")
+    if not 0 <= level <= INT_MAX:
+        raise ValueError(f"level out of range: {level}")
+    return {"player_name": player_name[:50], "score": score, "level": level}
+
+
+def parse_records(lines, fmt="legacy"):
+    """Yield score records from an iterable of text lines, one at a time.
+
+    Malformed rows are skipped so one bad line does not abort a large
+    import; a single summary is printed once the input is exhausted.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    skipped = 0
+    first_error = None
+    if fmt == "csv":
+        rows = ((row, row) for row in csv.DictReader(lines))
+    else:
+        rows = ((line, line.strip()) for line in lines if line.strip())
+
+    for raw, row in rows:
+        try:
+            if fmt == "csv":
+                yield _record(row.get("player_name"), row.get("score"), row.get("level"))
+            elif fmt == "ndjson":
+                obj = json.loads(row)
+                yield _record(obj.get("player_name"), obj.get("score", 0), obj.get("level", 1))
+            else:
+                name, score = row.rsplit(":", 1)
+                yield _record(name, score)
+        except (TypeError, ValueError, AttributeError) as e:
+            skipped += 1
+            if first_error is None:
+                first_error = f"{raw!r} ({e})"
+
+    if skipped:
+        print(f"⚠️ Skipped {skipped} malformed rows, first: {first_error}")
+
+
+def dedupe_max(records, max_pending=MAX_PENDING):
+    """Collapse records to the best score per player.
+
+    At most max_pending players are held at once; when the buffer fills it is
+    flushed downstream. A player may then be yielded more than once, which is
+    safe because the upsert only ever keeps the higher score.
+    """
+    best = {}
+    for rec in records:
+        current = best.get(rec["player_name"])
+        if current is None or rec["score"] > current["score"]:
+            best[rec["player_name"]] = rec
+        if len(best) >= max_pending:
+            yield from best.values()
+            best = {}
+    yield from best.values()
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------------------------------------------------------------------
+# 💾 Database
+# ---------------------------------------------------------------------
+def has_unique_player(conn):
+    """Create leaderboard if missing and report whether player_name is UNIQUE."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(CREATE_TABLE_SQL)
+        cursor.execute("SHOW INDEX FROM leaderboard WHERE Column_name='player_name' AND Non_unique=0")
+        return bool(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def migrate_unique_player(conn):
+    """One-off migration for tables created before player_name was UNIQUE.
+
+    Collapses duplicate rows to each player's best score, then adds the key.
+    Destructive: run it by hand (python leaderboard_io.py migrate), ideally
+    with the API stopped. If a save slips a new duplicate in between the
+    DELETE and the ALTER, the pair is retried.
+    """
+    if has_unique_player(conn):
+        return False
+    cursor = conn.cursor()
+    try:
+        for attempt in range(1, MIGRATE_ATTEMPTS + 1):
+            cursor.execute(DELETE_DUPLICATES_SQL)
+            conn.commit()
+            try:
+                cursor.execute("ALTER TABLE leaderboard ADD UNIQUE KEY uniq_player_name (player_name)")
+                return True
+            except Exception as e:
+                if attempt == MIGRATE_ATTEMPTS:
+                    raise
+                print(f"⚠️ Adding the unique key failed ({e}), retrying")
+    finally:
+        cursor.close()
+
+
+def import_records(conn, records, chunk_size=CHUNK_SIZE):
+    """Upsert records in multi-row batches, committing per chunk. Returns row count."""
+    if not has_unique_player(conn):
+        raise RuntimeError("leaderboard.player_name has no UNIQUE key; run 'python leaderboard_io.py migrate' first")
+    cursor = conn.cursor()
+    now = datetime.now()
+    total = 0
+    try:
+        for chunk in chunked(dedupe_max(records), chunk_size):
+            values = ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+            params = []
+            for rec in chunk:
+                params.extend((rec["player_name"], rec["score"], rec["level"], now))
+            cursor.execute(UPSERT_SQL.format(values=values), params)
+            conn.commit()
+            total += len(chunk)
+    finally:
+        cursor.close()
+    return total
+
+
+def export_records(conn, fetch_size=CHUNK_SIZE):
+    """Yield leaderboard rows as dicts using an unbuffered cursor."""
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute("SELECT player_name, score, level, last_played FROM leaderboard ORDER BY score DESC")
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for row in rows:
+                if isinstance(row.get("last_played"), datetime):
+                    row["last_played"] = row["last_played"].isoformat()
+                yield row
+    finally:
+        # A client that disconnects mid-export leaves rows unread. Drop the
+        # connection rather than reading the rest of the table just so the
+        # cursor can close (which would raise "Unread result found").
+        try:
+            if conn.unread_result:
+                conn.close()
+            else:
+                cursor.close()
+        except Exception as e:
+            print(f"⚠️ Failed to close export cursor: {e}")
+
+
+def format_records(rows, fmt="ndjson"):
+    """Serialize rows as text chunks (NDJSON lines or CSV with a header)."""
+    if fmt == "ndjson":
+        for row in rows:
+            yield json.dumps(row) + "\n"
+    elif fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=["player_name", "score", "level", "last_played"])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+        if buf.tell():
+            yield buf.getvalue()
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+# ---------------------------------------------------------------------
+# 🚀 CLI
+# ---------------------------------------------------------------------
+def main(argv):
+    import mysql.connector
+    from config_tidb import TIDB_CONFIG
+
+    if len(argv) < 2 or argv[1] not in ("migrate", "import", "export"):
+        print(__doc__)
+        return 1
+
+    conn = mysql.connector.connect(**TIDB_CONFIG)
+    try:
+        if argv[1] == "migrate":
+            if migrate_unique_player(conn):
+                print("✅ Added unique key on leaderboard.player_name", file=sys.stderr)
+            else:
+                print("leaderboard.player_name is already unique", file=sys.stderr)
+        elif argv[1] == "import":
+            if len(argv) < 3:
+                print(__doc__)
+                return 1
+            path = argv[2]
+            fmt = argv[3] if len(argv) > 3 else guess_format(path)
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                total = import_records(conn, parse_records(f, fmt))
+            print(f"✅ Imported {total} player rows from {path}", file=sys.stderr)
+        else:
+            fmt = argv[2] if len(argv) > 2 else "ndjson"
+            for chunk in format_records(export_records(conn), fmt):
+                sys.stdout.write(chunk)
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
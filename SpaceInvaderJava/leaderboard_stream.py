@@ -0,0 +1,92 @@
+# leaderboard_stream.py
+"""In-process fan-out of live leaderboard changes for the SSE endpoint."""
+import json
+import queue
+import threading
+import time
+
+
+class LeaderboardBroadcaster:
+    """Fans out top-N changes to every connected stream in this process.
+
+    Each subscriber gets its own queue; publish() diffs the new top-N against
+    the last one and only pushes the ranks that actually changed.
+    """
+
+    def __init__(self, size=10):
+        self.size = size
+        self.top = None
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.published_seq = 0
+        self.updated_at = None
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=100)
+        with self.lock:
+            self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.discard(q)
+
+    def might_change(self, score):
+        """Cheap pre-check so saves that can't reach the top-N skip the DB query."""
+        with self.lock:
+            if self.top is None or len(self.top) < self.size:
+                return True
+            return score >= self.top[-1]["score"]
+
+    def refresh(self, fetch):
+        """Fetch the current top-N and publish it.
+
+        Each fetch takes a sequence number before it starts and no lock is
+        held across the query; a read that finishes after a newer one has
+        already been published is dropped.
+        """
+        with self.lock:
+            self.seq += 1
+            seq = self.seq
+        self.publish(fetch(), seq)
+
+    def is_fresh(self, max_age):
+        with self.lock:
+            return self.updated_at is not None and time.monotonic() - self.updated_at < max_age
+
+    def publish(self, rows, seq=None):
+        with self.lock:
+            if seq is not None:
+                if seq < self.published_seq:
+                    return
+                self.published_seq = seq
+            self.updated_at = time.monotonic()
+            old = self.top or []
+            self.top = rows
+            changed = [dict(row, rank=i + 1) for i, row in enumerate(rows)
+                       if i >= len(old) or old[i] != row]
+            if not changed and len(old) == len(rows):
+                return
+            event = {"size": len(rows), "rows": changed}
+            for q in list(self.subscribers):
+                try:
+                    q.put_nowait(event)
+                except queue.Full:
+                    # Slow client: drop it rather than stall every other stream
+                    self.subscribers.discard(q)
+                    try:
+                        q.get_nowait()
+                        q.put_nowait(None)
+                    except (queue.Empty, queue.Full):
+                        pass
+
+    def snapshot(self):
+        with self.lock:
+            if self.top is None:
+                return None
+            return {"size": len(self.top), "rows": [dict(row, rank=i + 1) for i, row in enumerate(self.top)]}
+
+
+def sse_message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,10 +1,11 @@
-import pygame, sys, os, random, asyncio
+import pygame, sys, os, random, asyncio, json, threading
 from random import shuffle
 from datetime import datetime
 import mysql.connector
 from dotenv import load_dotenv
 import requests
 from api_server import TIDB_CONFIG, API_SERVER
+from particles import ParticleSystem
 
 # --- INIT ---
 
@@ -50,6 +51,7 @@ pending_quiz = None
 player_name = ""
 QUIZ_INTERVAL = 10000
 quiz_timer = pygame.time.get_ticks()
+particles = ParticleSystem(capacity=4096)
 
 # --- LOCAL FALLBACK DATABASE (if TiDB fails) ---
 class WebDatabase:
@@ -273,11 +275,84 @@ def get_leaderboard():
         return web_db.get_leaderboard(10)
 
 
+class LeaderboardFeed:
+    """Keeps a live copy of the top-N from the API's SSE stream.
+
+    A background thread holds one connection open for the session and
+    applies the changed rows as they arrive, so reopening the leaderboard
+    doesn't hit the API. Where threads can't start (the pygbag/WASM build)
+    the feed disables itself and callers fall back to get_leaderboard().
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.rows = []
+        self.connected = False
+        self.available = True
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        if not self.available:
+            return
+        if self.thread is None or not self.thread.is_alive():
+            try:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            except Exception as e:
+                print(f"Live leaderboard unavailable: {e}")
+                self.available = False
+                self.thread = None
+
+    def _apply(self, event, data):
+        with self.lock:
+            if event == "snapshot":
+                self.rows = [None] * data["size"]
+            else:
+                self.rows = (self.rows + [None] * data["size"])[:data["size"]]
+            for row in data["rows"]:
+                self.rows[row["rank"] - 1] = (row["player_name"], row.get("score", 0))
+            self.connected = True
+
+    def _run(self):
+        try:
+            with requests.get(self.url, stream=True, timeout=(5, 60)) as response:
+                response.raise_for_status()
+                event, data = "message", []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line is None:
+                        continue
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        self._apply(event, json.loads("\n".join(data)))
+                        event, data = "message", []
+        except Exception as e:
+            print(f"Leaderboard stream closed: {e}")
+        with self.lock:
+            self.connected = False
+
+    def get(self):
+        with self.lock:
+            if not self.connected:
+                return None
+            return [row for row in self.rows if row is not None]
+
+
+leaderboard_feed = LeaderboardFeed(f"{API_SERVER}/api/leaderboard/stream")
+
+
 async def draw_leaderboard():
-    lb = get_leaderboard()
+    leaderboard_feed.start()
+    lb = leaderboard_feed.get()
+    if lb is None:
+        lb = get_leaderboard()
     leaderboard_active = True
 
     while leaderboard_active:
+        lb = leaderboard_feed.get() or lb
         screen.fill((10, 10, 30))
         title = BIGFONT.render("🏆 LEADERBOARD", True, (0, 255, 255))
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
@@ -354,6 +429,7 @@ async def display_leaderboard_after_game():
 
 # --- GAME UTILS ---
 def reset_game():
+    particles.clear()
     return [], [], WIDTH // 2 - 50, HEIGHT - 150, 0
 
 
@@ -497,6 +573,7 @@ async def main():
                         b["y"] < e["y"] + 80 and e["y"] < b["y"] + 50):
                     bullets.remove(b)
                     enemies.remove(e)
+                    particles.emit(e["x"] + 40, e["y"] + 40)
                     try:
                         explosion_sfx.play()  # 💥 Boom effect
                     except:
@@ -504,6 +581,8 @@ async def main():
                     score += 10
                     break
 
+        particles.update(WIDTH, HEIGHT)
+
         # Level completion check
         if all(q["answered"] for q in QUESTIONS_BY_LEVEL[level]):
             if level < LEVELS:
@@ -546,6 +625,7 @@ async def main():
             screen.blit(bullet_img, (b["x"], b["y"]))
         for e in enemies:
             screen.blit(enemy_img, (e["x"], e["y"]))
+        particles.draw(screen)
 
         hud = FONT.render(f"{player_name} | Score: {score} | Level: {level}", True, (0, 255, 255))
         screen.blit(hud, (20, 20))
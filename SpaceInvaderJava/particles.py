@@ -0,0 +1,129 @@
+# particles.py
+import numpy as np
+import pygame
+
+# --- EXPLOSION PALETTE ---
+EXPLOSION_COLORS = np.array([
+    (255, 240, 120),
+    (255, 180, 40),
+    (255, 110, 20),
+    (220, 40, 20),
+], dtype=np.float32)
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool backed by numpy arrays.
+
+    Live particles are always packed into slots [0, count), so update and
+    draw only ever touch one contiguous slice and never allocate per particle.
+    """
+
+    def __init__(self, capacity=4096, gravity=0.12, drag=0.96):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.drag = drag
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.rng = np.random.default_rng()
+        self.use_pixels = True
+
+    def clear(self):
+        self.count = 0
+
+    def _reserve(self, n):
+        """Return slot indices for n new particles, degrading when the pool is full."""
+        free = self.capacity - self.count
+        if n <= free:
+            slots = np.arange(self.count, self.count + n)
+            self.count += n
+            return slots
+        # Over the cap: fill what is left, then recycle the particles that
+        # were about to die anyway. Never recycle more than half the pool so
+        # a burst of explosions thins out instead of wiping older ones.
+        stolen = min(n - free, self.count // 2)
+        slots = np.arange(self.count, self.capacity)
+        if stolen > 0:
+            oldest = np.argpartition(self.life[:self.count], stolen - 1)[:stolen]
+            slots = np.concatenate((slots, oldest))
+        self.count = self.capacity
+        return slots
+
+    def emit(self, x, y, n=60, speed=6.0, life=40):
+        """Spawn a radial burst of n particles centred on (x, y)."""
+        slots = self._reserve(n)
+        k = len(slots)
+        if k == 0:
+            return 0
+
+        angle = self.rng.uniform(0.0, 2.0 * np.pi, k)
+        mag = speed * np.sqrt(self.rng.uniform(0.05, 1.0, k))
+        self.pos[slots, 0] = x
+        self.pos[slots, 1] = y
+        self.vel[slots, 0] = np.cos(angle) * mag
+        self.vel[slots, 1] = np.sin(angle) * mag
+        lifetimes = self.rng.uniform(0.5 * life, life, k).astype(np.float32)
+        self.life[slots] = lifetimes
+        self.max_life[slots] = lifetimes
+        self.color[slots] = EXPLOSION_COLORS[self.rng.integers(0, len(EXPLOSION_COLORS), k)]
+        return k
+
+    def update(self, width, height):
+        """Advance every live particle one frame and cull dead/off-screen ones."""
+        n = self.count
+        if n == 0:
+            return
+
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+        vel *= self.drag
+        vel[:, 1] += self.gravity
+        pos += vel
+        life -= 1.0
+
+        alive = ((life > 0) &
+                 (pos[:, 0] >= 0) & (pos[:, 0] < width) &
+                 (pos[:, 1] >= 0) & (pos[:, 1] < height))
+        k = int(np.count_nonzero(alive))
+        if k == n:
+            return
+
+        # Compact survivors to the front of the pool
+        self.pos[:k] = pos[alive]
+        self.vel[:k] = vel[alive]
+        self.life[:k] = life[alive]
+        self.max_life[:k] = self.max_life[:n][alive]
+        self.color[:k] = self.color[:n][alive]
+        self.count = k
+
+    def draw(self, surface):
+        """Blit all live particles as 2x2 pixels, fading out with remaining life."""
+        n = self.count
+        if n == 0:
+            return
+
+        w, h = surface.get_size()
+        xs = self.pos[:n, 0].astype(np.intp)
+        ys = self.pos[:n, 1].astype(np.intp)
+        fade = (self.life[:n] / self.max_life[:n])[:, None]
+        colors = (self.color[:n] * fade).astype(np.uint8)
+
+        if self.use_pixels:
+            try:
+                pixels = pygame.surfarray.pixels3d(surface)
+            except Exception as e:
+                # e.g. 8/16-bit surfaces: switch to per-particle rects for good
+                print(f"Particle pixel access unavailable ({e}), falling back to rects")
+                self.use_pixels = False
+        if not self.use_pixels:
+            for x, y, color in zip(xs.tolist(), ys.tolist(), colors.tolist()):
+                surface.fill(color, (x, y, 2, 2))
+            return
+
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            px, py = xs + dx, ys + dy
+            on_screen = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            pixels[px[on_screen], py[on_screen]] = colors[on_screen]
+        del pixels  # release the surface lock before the next blit
@@ -0,0 +1,132 @@
+import io
+import json
+import os
+
+import pytest
+
+from leaderboard_io import (dedupe_max, export_records, format_records, import_records,
+                            migrate_unique_player, parse_records)
+
+HIGHSCORES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "highscores.txt")
+
+
+def test_parse_legacy_skips_malformed_with_one_summary(capsys):
+    lines = ["divya:690\n", "\n", "garbage\n", "halo:abc\n", "halo:400\n"]
+    records = list(parse_records(lines, "legacy"))
+    assert records == [
+        {"player_name": "divya", "score": 690, "level": 1},
+        {"player_name": "halo", "score": 400, "level": 1},
+    ]
+    out = capsys.readouterr().out
+    assert out.count("\n") == 1
+    assert "Skipped 2 malformed rows" in out
+
+
+def test_parse_csv_with_bom():
+    raw = b"\xef\xbb\xbfplayer_name,score,level\ndivya,690,3\n"
+    lines = io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8-sig", newline="")
+    assert list(parse_records(lines, "csv")) == [{"player_name": "divya", "score": 690, "level": 3}]
+
+
+def test_parse_ndjson():
+    lines = [json.dumps({"player_name": "halo", "score": 260, "level": 2}) + "\n"]
+    assert list(parse_records(lines, "ndjson")) == [{"player_name": "halo", "score": 260, "level": 2}]
+
+
+def test_dedupe_keeps_max_per_player():
+    with open(HIGHSCORES, encoding="utf-8") as f:
+        best = {r["player_name"]: r["score"] for r in dedupe_max(parse_records(f))}
+    assert best == {"divya": 690, "halo": 400}
+
+
+def test_dedupe_flushes_when_buffer_full():
+    records = [{"player_name": n, "score": s, "level": 1} for n, s in
+               [("a", 1), ("b", 2), ("a", 5), ("c", 3)]]
+    out = list(dedupe_max(records, max_pending=2))
+    assert len(out) == 4
+    assert max(r["score"] for r in out if r["player_name"] == "a") == 5
+
+
+def test_format_records_ndjson_and_csv():
+    rows = [{"player_name": "a,b", "score": 1, "level": 2, "last_played": None}]
+    assert list(format_records(rows, "ndjson")) == [json.dumps(rows[0]) + "\n"]
+    assert "".join(format_records(rows, "csv")) == 'player_name,score,level,last_played\r\n"a,b",1,2,\r\n'
+    assert "".join(format_records([], "csv")) == "player_name,score,level,last_played\r\n"
+
+
+class FakeCursor:
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def fetchall(self):
+        return self.indexes
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self, indexes):
+        self.cur = FakeCursor(indexes)
+
+    def cursor(self, **kwargs):
+        return self.cur
+
+    def commit(self):
+        pass
+
+
+def test_parse_skips_out_of_range_scores(capsys):
+    lines = ["big:99999999999\n", "neg:-5\n", "ok:10\n"]
+    assert list(parse_records(lines, "legacy")) == [{"player_name": "ok", "score": 10, "level": 1}]
+    assert "Skipped 2 malformed rows" in capsys.readouterr().out
+
+
+def test_import_refuses_without_unique_key():
+    conn = FakeConn(indexes=[])
+    with pytest.raises(RuntimeError, match="migrate"):
+        import_records(conn, iter([{"player_name": "a", "score": 1, "level": 1}]))
+    assert not any(s.startswith(("INSERT", "DELETE", "ALTER")) for s in conn.cur.statements)
+
+
+def test_migrate_collapses_duplicates_then_adds_key():
+    conn = FakeConn(indexes=[])
+    assert migrate_unique_player(conn)
+    assert conn.cur.statements[-2].startswith("DELETE l1 FROM leaderboard")
+    assert conn.cur.statements[-1].startswith("ALTER TABLE leaderboard ADD UNIQUE")
+
+
+def test_migrate_noop_when_key_exists():
+    conn = FakeConn(indexes=[("leaderboard", 0, "player_name")])
+    assert not migrate_unique_player(conn)
+    assert not any(s.startswith(("DELETE", "ALTER")) for s in conn.cur.statements)
+
+
+class ExportConn(FakeConn):
+    def __init__(self):
+        super().__init__(indexes=[])
+        self.unread_result = False
+        self.closed = False
+        self.cur.fetchmany = self.fetchmany
+
+    def fetchmany(self, size):
+        self.unread_result = True
+        return [{"player_name": "a", "score": 1, "level": 1, "last_played": None}] * size
+
+    def consume_results(self):
+        raise AssertionError("export must not drain the remaining rows")
+
+    def close(self):
+        self.closed = True
+
+
+def test_export_abandoned_midway_closes_connection_without_draining():
+    conn = ExportConn()
+    rows = export_records(conn, fetch_size=2)
+    next(rows)
+    rows.close()
+    assert conn.closed
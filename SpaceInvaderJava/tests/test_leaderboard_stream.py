@@ -0,0 +1,105 @@
+import json
+import queue
+
+from leaderboard_stream import LeaderboardBroadcaster, sse_message
+
+
+def rows(*pairs):
+    return [{"player_name": name, "score": score, "level": 1} for name, score in pairs]
+
+
+def drain(q):
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    return events
+
+
+def test_publish_sends_only_changed_ranks():
+    b = LeaderboardBroadcaster(size=3)
+    b.publish(rows(("a", 50), ("b", 40)))
+    q = b.subscribe()
+
+    b.publish(rows(("a", 50), ("c", 45), ("b", 40)))
+    b.publish(rows(("a", 50), ("c", 45), ("b", 40)))  # no change, no event
+
+    assert drain(q) == [{
+        "size": 3,
+        "rows": [dict(rows(("c", 45))[0], rank=2), dict(rows(("b", 40))[0], rank=3)],
+    }]
+    assert b.snapshot()["rows"][0] == dict(rows(("a", 50))[0], rank=1)
+
+
+def test_might_change_uses_cached_cutoff():
+    b = LeaderboardBroadcaster(size=2)
+    assert b.might_change(0)
+    b.publish(rows(("a", 50), ("b", 40)))
+    assert not b.might_change(39)
+    assert b.might_change(40)
+
+
+def test_slow_client_is_dropped_without_blocking_others():
+    b = LeaderboardBroadcaster(size=1)
+    slow = b.subscribe()
+    fast = b.subscribe()
+    for _ in range(slow.maxsize):
+        slow.put_nowait({"filler": True})
+
+    b.publish(rows(("a", 1)))
+
+    assert slow not in b.subscribers
+    assert drain(slow)[-1] is None
+    assert drain(fast) == [{"size": 1, "rows": [dict(rows(("a", 1))[0], rank=1)]}]
+
+
+class EmptiedQueue(queue.Queue):
+    """Reports Full, then looks empty: the reader drained it in between."""
+
+    def put_nowait(self, item):
+        raise queue.Full
+
+    def get_nowait(self):
+        raise queue.Empty
+
+
+def test_publish_survives_queue_drained_mid_drop():
+    b = LeaderboardBroadcaster(size=1)
+    b.subscribers.add(EmptiedQueue())
+    fast = b.subscribe()
+
+    b.publish(rows(("a", 1)))
+
+    assert len(drain(fast)) == 1
+
+
+def test_refresh_publishes_fetched_rows():
+    b = LeaderboardBroadcaster(size=1)
+    b.refresh(lambda: rows(("a", 7)))
+    assert b.snapshot() == {"size": 1, "rows": [dict(rows(("a", 7))[0], rank=1)]}
+
+
+def test_sse_message_format():
+    msg = sse_message("update", {"size": 0, "rows": []})
+    assert msg.startswith("event: update\ndata: ")
+    assert msg.endswith("\n\n")
+    assert json.loads(msg.split("data: ", 1)[1]) == {"size": 0, "rows": []}
+
+
+def test_refresh_drops_read_overtaken_by_newer_one():
+    b = LeaderboardBroadcaster(size=1)
+
+    def slow_old_read():
+        # A newer refresh starts and publishes while this read is in flight
+        b.refresh(lambda: rows(("new", 9)))
+        return rows(("old", 1))
+
+    b.refresh(slow_old_read)
+    assert b.snapshot()["rows"][0]["player_name"] == "new"
+
+
+def test_is_fresh_tracks_last_publish():
+    b = LeaderboardBroadcaster(size=1)
+    assert not b.is_fresh(5)
+    b.publish(rows(("a", 1)))
+    assert b.is_fresh(5)
+    assert not b.is_fresh(0)
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pygame = pytest.importorskip("pygame")
+
+from particles import ParticleSystem
+
+WIDTH, HEIGHT = 1200, 800
+
+
+def test_reserve_packs_slots_and_respects_cap():
+    ps = ParticleSystem(capacity=100)
+    assert list(ps._reserve(30)) == list(range(30))
+    assert ps.count == 30
+
+    # Over the cap: remaining 70 free slots plus at most half the live pool
+    slots = ps._reserve(200)
+    assert ps.count == 100
+    assert len(slots) == 70 + 15
+    assert len(set(slots.tolist())) == len(slots)
+
+
+def test_emit_degrades_instead_of_overflowing():
+    ps = ParticleSystem(capacity=128)
+    for _ in range(10):
+        ps.emit(WIDTH / 2, HEIGHT / 2, n=60)
+    assert ps.count == 128
+
+
+def test_update_compacts_dead_and_offscreen_particles():
+    ps = ParticleSystem(capacity=10, gravity=0.0, drag=1.0)
+    ps.emit(50, 50, n=3, speed=0.0, life=10)
+    ps.life[1] = 0.5            # dies this frame
+    ps.pos[2] = (-10, 50)       # already off-screen
+    ps.update(WIDTH, HEIGHT)
+    assert ps.count == 1
+    assert tuple(ps.pos[0]) == (50, 50)
+
+
+def test_clear_empties_pool():
+    ps = ParticleSystem(capacity=64)
+    ps.emit(10, 10, n=20)
+    ps.clear()
+    assert ps.count == 0
+
+
+def test_draw_writes_pixels():
+    surface = pygame.Surface((WIDTH, HEIGHT), 0, 32)
+    ps = ParticleSystem(capacity=16)
+    ps.emit(100, 100, n=1, speed=0.0)
+    ps.draw(surface)
+    assert surface.get_at((100, 100))[:3] != (0, 0, 0)
+
+
+def test_4k_particles_fit_frame_budget():
+    surface = pygame.Surface((WIDTH, HEIGHT), 0, 32)
+    ps = ParticleSystem(capacity=4096)
+    frames = 60
+    start = time.perf_counter()
+    for _ in range(frames):
+        while ps.count < ps.capacity:
+            ps.emit(WIDTH / 2, HEIGHT / 2, n=60, life=1000)
+        ps.update(WIDTH, HEIGHT)
+        ps.draw(surface)
+    per_frame = (time.perf_counter() - start) / frames
+    assert per_frame < 0.016, f"{per_frame * 1000:.2f} ms per frame"